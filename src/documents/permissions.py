@@ -4,7 +4,7 @@ from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
 from guardian.core import ObjectPermissionChecker
 from guardian.models import GroupObjectPermission
-from guardian.shortcuts import assign_perm
+from guardian.models import UserObjectPermission
 from guardian.shortcuts import get_objects_for_user
 from guardian.shortcuts import get_users_with_perms
 from guardian.shortcuts import remove_perm
@@ -57,6 +57,43 @@ def get_groups_with_only_permission(obj, codename):
     return Group.objects.filter(id__in=group_object_perm_group_ids).distinct()
 
 
+def bulk_assign_perms(codenames: list[str], users_or_groups, object):
+    """
+    Assigns each of the given object permissions to every user or group in the
+    given queryset using a single insert. Permissions which are already
+    assigned are left untouched.
+
+    Raises Permission.DoesNotExist if any of the codenames is unknown for the
+    object's model, like guardian's assign_perm.
+    """
+    ctype = ContentType.objects.get_for_model(object)
+    permissions = list(
+        Permission.objects.filter(content_type=ctype, codename__in=codenames),
+    )
+    if len(permissions) != len(set(codenames)):
+        missing = set(codenames) - {permission.codename for permission in permissions}
+        raise Permission.DoesNotExist(
+            f"Unknown permissions for {ctype.model}: {', '.join(sorted(missing))}",
+        )
+    if users_or_groups.model is User:
+        model, field = UserObjectPermission, "user"
+    else:
+        model, field = GroupObjectPermission, "group"
+    model.objects.bulk_create(
+        [
+            model(
+                **{field: user_or_group},
+                permission=permission,
+                content_type=ctype,
+                object_pk=object.pk,
+            )
+            for user_or_group in users_or_groups
+            for permission in permissions
+        ],
+        ignore_conflicts=True,
+    )
+
+
 def set_permissions_for_object(permissions: list[str], object, merge: bool = False):
     """
     Set permissions for an object. The permissions are given as a list of strings
@@ -69,6 +106,10 @@ def set_permissions_for_object(permissions: list[str], object, merge: bool = Fal
 
     for action in permissions:
         permission = f"{action}_{object.__class__.__name__.lower()}"
+        perms_to_assign = [permission]
+        if action == "change":
+            # change gives view too
+            perms_to_assign.append(f"view_{object.__class__.__name__.lower()}")
         # users
         users_to_add = User.objects.filter(id__in=permissions[action]["users"])
         users_to_remove = (
@@ -86,15 +127,7 @@ def set_permissions_for_object(permissions: list[str], object, merge: bool = Fal
             for user in users_to_remove:
                 remove_perm(permission, user, object)
         if len(users_to_add) > 0:
-            for user in users_to_add:
-                assign_perm(permission, user, object)
-                if action == "change":
-                    # change gives view too
-                    assign_perm(
-                        f"view_{object.__class__.__name__.lower()}",
-                        user,
-                        object,
-                    )
+            bulk_assign_perms(perms_to_assign, users_to_add, object)
         # groups
         groups_to_add = Group.objects.filter(id__in=permissions[action]["groups"])
         groups_to_remove = (
@@ -111,15 +144,7 @@ def set_permissions_for_object(permissions: list[str], object, merge: bool = Fal
             for group in groups_to_remove:
                 remove_perm(permission, group, object)
         if len(groups_to_add) > 0:
-            for group in groups_to_add:
-                assign_perm(permission, group, object)
-                if action == "change":
-                    # change gives view too
-                    assign_perm(
-                        f"view_{object.__class__.__name__.lower()}",
-                        group,
-                        object,
-                    )
+            bulk_assign_perms(perms_to_assign, groups_to_add, object)
 
 
 def get_objects_for_user_owner_aware(user, perms, Model):
@@ -1,11 +1,14 @@
 from unittest import mock
 
 from django.contrib.auth.models import Group
+from django.contrib.auth.models import Permission
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from guardian.models import GroupObjectPermission
+from guardian.models import UserObjectPermission
 from guardian.shortcuts import assign_perm
-from guardian.shortcuts import get_groups_with_perms
-from guardian.shortcuts import get_users_with_perms
+from guardian.shortcuts import get_perms
 
 from documents import bulk_edit
 from documents.models import Correspondent
@@ -13,47 +16,56 @@ from documents.models import Document
 from documents.models import DocumentType
 from documents.models import StoragePath
 from documents.models import Tag
+from documents.permissions import bulk_assign_perms
+from documents.permissions import set_permissions_for_object
 from documents.tests.utils import DirectoriesMixin
 
 
 class TestBulkEdit(DirectoriesMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.c1 = Correspondent.objects.create(name="c1")
+        cls.c2 = Correspondent.objects.create(name="c2")
+        cls.dt1 = DocumentType.objects.create(name="dt1")
+        cls.dt2 = DocumentType.objects.create(name="dt2")
+        cls.t1 = Tag.objects.create(name="t1")
+        cls.t2 = Tag.objects.create(name="t2")
+        (
+            cls.doc1,
+            cls.doc2,
+            cls.doc3,
+            cls.doc4,
+            cls.doc5,
+        ) = Document.objects.bulk_create(
+            [
+                Document(checksum="A", title="A"),
+                Document(
+                    checksum="B",
+                    title="B",
+                    correspondent=cls.c1,
+                    document_type=cls.dt1,
+                ),
+                Document(
+                    checksum="C",
+                    title="C",
+                    correspondent=cls.c2,
+                    document_type=cls.dt2,
+                ),
+                Document(checksum="D", title="D"),
+                Document(checksum="E", title="E"),
+            ],
+        )
+        cls.doc2.tags.add(cls.t1)
+        cls.doc3.tags.add(cls.t2)
+        cls.doc4.tags.add(cls.t1, cls.t2)
+        cls.sp1 = StoragePath.objects.create(name="sp1", path="Something/{checksum}")
+
     def setUp(self):
         super().setUp()
 
-        self.owner = User.objects.create(username="test_owner")
-        self.user1 = User.objects.create(username="user1")
-        self.user2 = User.objects.create(username="user2")
-        self.group1 = Group.objects.create(name="group1")
-        self.group2 = Group.objects.create(name="group2")
-
         patcher = mock.patch("documents.bulk_edit.bulk_update_documents.delay")
         self.async_task = patcher.start()
         self.addCleanup(patcher.stop)
-        self.c1 = Correspondent.objects.create(name="c1")
-        self.c2 = Correspondent.objects.create(name="c2")
-        self.dt1 = DocumentType.objects.create(name="dt1")
-        self.dt2 = DocumentType.objects.create(name="dt2")
-        self.t1 = Tag.objects.create(name="t1")
-        self.t2 = Tag.objects.create(name="t2")
-        self.doc1 = Document.objects.create(checksum="A", title="A")
-        self.doc2 = Document.objects.create(
-            checksum="B",
-            title="B",
-            correspondent=self.c1,
-            document_type=self.dt1,
-        )
-        self.doc3 = Document.objects.create(
-            checksum="C",
-            title="C",
-            correspondent=self.c2,
-            document_type=self.dt2,
-        )
-        self.doc4 = Document.objects.create(checksum="D", title="D")
-        self.doc5 = Document.objects.create(checksum="E", title="E")
-        self.doc2.tags.add(self.t1)
-        self.doc3.tags.add(self.t2)
-        self.doc4.tags.add(self.t1, self.t2)
-        self.sp1 = StoragePath.objects.create(name="sp1", path="Something/{checksum}")
 
     def test_set_correspondent(self):
         self.assertEqual(Document.objects.filter(correspondent=self.c2).count(), 1)
@@ -193,8 +205,59 @@ class TestBulkEdit(DirectoriesMixin, TestCase):
             [self.doc3.id, self.doc4.id, self.doc5.id],
         )
 
-    @mock.patch("documents.tasks.bulk_update_documents.delay")
-    def test_set_permissions(self, m):
+
+class TestBulkEditPermissions(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner, cls.user1, cls.user2 = User.objects.bulk_create(
+            [
+                User(username="test_owner"),
+                User(username="user1"),
+                User(username="user2"),
+            ],
+        )
+        cls.group1, cls.group2 = Group.objects.bulk_create(
+            [Group(name="group1"), Group(name="group2")],
+        )
+        cls.doc1, cls.doc2, cls.doc3 = Document.objects.bulk_create(
+            [
+                Document(checksum="A", title="A"),
+                Document(checksum="B", title="B"),
+                Document(checksum="C", title="C"),
+            ],
+        )
+        cls.doc_ct = ContentType.objects.get_for_model(Document)
+
+    def setUp(self):
+        super().setUp()
+
+        patcher = mock.patch("documents.bulk_edit.bulk_update_documents.delay")
+        self.async_task = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _user_perm_count(self, doc: Document) -> int:
+        return (
+            UserObjectPermission.objects.filter(
+                content_type=self.doc_ct,
+                object_pk=str(doc.pk),
+            )
+            .values_list("user_id", flat=True)
+            .distinct()
+            .count()
+        )
+
+    def _group_perm_count(self, doc: Document) -> int:
+        return (
+            GroupObjectPermission.objects.filter(
+                content_type=self.doc_ct,
+                object_pk=str(doc.pk),
+            )
+            .values_list("group_id", flat=True)
+            .distinct()
+            .count()
+        )
+
+    def test_set_permissions(self):
         doc_ids = [self.doc1.id, self.doc2.id, self.doc3.id]
 
         assign_perm("view_document", self.group1, self.doc1)
@@ -216,24 +279,17 @@ class TestBulkEdit(DirectoriesMixin, TestCase):
             owner=self.owner,
             merge=False,
         )
-        m.assert_called_once()
+        self.async_task.assert_called_once()
 
         self.assertEqual(Document.objects.filter(owner=self.owner).count(), 3)
         self.assertEqual(Document.objects.filter(id__in=doc_ids).count(), 3)
 
-        users_with_perms = get_users_with_perms(
-            self.doc1,
-        )
-        self.assertEqual(users_with_perms.count(), 2)
+        self.assertEqual(self._user_perm_count(self.doc1), 2)
 
         # group1 should be replaced by group2
-        groups_with_perms = get_groups_with_perms(
-            self.doc1,
-        )
-        self.assertEqual(groups_with_perms.count(), 1)
+        self.assertEqual(self._group_perm_count(self.doc1), 1)
 
-    @mock.patch("documents.tasks.bulk_update_documents.delay")
-    def test_set_permissions_merge(self, m):
+    def test_set_permissions_merge(self):
         doc_ids = [self.doc1.id, self.doc2.id, self.doc3.id]
 
         self.doc1.owner = self.user1
@@ -258,20 +314,93 @@ class TestBulkEdit(DirectoriesMixin, TestCase):
             owner=self.owner,
             merge=True,
         )
-        m.assert_called_once()
+        self.async_task.assert_called_once()
 
         # when merge is true owner doesn't get replaced if its not empty
         self.assertEqual(Document.objects.filter(owner=self.owner).count(), 2)
         self.assertEqual(Document.objects.filter(id__in=doc_ids).count(), 3)
 
         # merge of user1 which was pre-existing and user2
-        users_with_perms = get_users_with_perms(
-            self.doc1,
-        )
-        self.assertEqual(users_with_perms.count(), 2)
+        self.assertEqual(self._user_perm_count(self.doc1), 2)
 
         # group1 should be merged by group2
-        groups_with_perms = get_groups_with_perms(
+        self.assertEqual(self._group_perm_count(self.doc1), 2)
+
+    def test_set_permissions_change_grants_view(self):
+        """
+        GIVEN:
+            - Document without any object permissions
+        WHEN:
+            - Change permission is set for a user and a group
+        THEN:
+            - User and group are granted both change and view permissions
+        """
+        set_permissions_for_object(
+            permissions={
+                "change": {
+                    "users": [self.user1.id],
+                    "groups": [self.group1.id],
+                },
+            },
+            object=self.doc1,
+        )
+
+        self.assertCountEqual(
+            get_perms(self.user1, self.doc1),
+            ["change_document", "view_document"],
+        )
+        self.assertCountEqual(
+            get_perms(self.group1, self.doc1),
+            ["change_document", "view_document"],
+        )
+        self.assertEqual(get_perms(self.user2, self.doc1), [])
+
+    def test_bulk_assign_perms_existing(self):
+        """
+        GIVEN:
+            - Document where one user already has view permission
+        WHEN:
+            - View and change permissions are bulk assigned to that user and another
+        THEN:
+            - The existing assignment is kept without error
+            - Both users have both permissions, with no duplicate rows
+        """
+        assign_perm("view_document", self.user1, self.doc1)
+
+        bulk_assign_perms(
+            ["view_document", "change_document"],
+            User.objects.filter(id__in=[self.user1.id, self.user2.id]),
             self.doc1,
         )
-        self.assertEqual(groups_with_perms.count(), 2)
+
+        for user in [self.user1, self.user2]:
+            self.assertCountEqual(
+                get_perms(user, self.doc1),
+                ["change_document", "view_document"],
+            )
+        self.assertEqual(
+            UserObjectPermission.objects.filter(
+                content_type=self.doc_ct,
+                object_pk=str(self.doc1.pk),
+            ).count(),
+            4,
+        )
+
+    def test_bulk_assign_perms_unknown_permission(self):
+        """
+        GIVEN:
+            - Document without any object permissions
+        WHEN:
+            - Permissions are bulk assigned, one of which does not exist
+        THEN:
+            - Permission.DoesNotExist is raised
+            - No permissions are assigned
+        """
+        with self.assertRaises(Permission.DoesNotExist):
+            bulk_assign_perms(
+                ["view_document", "frobnicate_document"],
+                Group.objects.filter(id=self.group1.id),
+                self.doc1,
+            )
+
+        self.assertEqual(self._group_perm_count(self.doc1), 0)
@@ -1,10 +1,12 @@
+import os
 import shutil
 import tempfile
 import time
 import warnings
-from collections import namedtuple
 from collections.abc import Iterator
 from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field
 from os import PathLike
 from pathlib import Path
 from typing import Any
@@ -27,26 +29,53 @@ from documents.parsers import ParseError
 from documents.plugins.helpers import ProgressStatusOptions
 
 
-def setup_directories():
-    dirs = namedtuple("Dirs", ())
-
-    dirs.data_dir = Path(tempfile.mkdtemp())
-    dirs.scratch_dir = Path(tempfile.mkdtemp())
-    dirs.media_dir = Path(tempfile.mkdtemp())
-    dirs.consumption_dir = Path(tempfile.mkdtemp())
-    dirs.static_dir = Path(tempfile.mkdtemp())
-    dirs.index_dir = dirs.data_dir / "index"
-    dirs.originals_dir = dirs.media_dir / "documents" / "originals"
-    dirs.thumbnail_dir = dirs.media_dir / "documents" / "thumbnails"
-    dirs.archive_dir = dirs.media_dir / "documents" / "archive"
-    dirs.logging_dir = dirs.data_dir / "log"
-
+@dataclass
+class Dirs:
+    root_dir: Path
+    data_dir: Path
+    scratch_dir: Path
+    media_dir: Path
+    consumption_dir: Path
+    static_dir: Path
+    index_dir: Path
+    originals_dir: Path
+    thumbnail_dir: Path
+    archive_dir: Path
+    logging_dir: Path
+    settings_override: override_settings = field(init=False)
+
+
+def _make_subdirectories(dirs: Dirs):
+    dirs.scratch_dir.mkdir(exist_ok=True)
+    dirs.consumption_dir.mkdir(exist_ok=True)
+    dirs.static_dir.mkdir(exist_ok=True)
     dirs.index_dir.mkdir(parents=True, exist_ok=True)
     dirs.originals_dir.mkdir(parents=True, exist_ok=True)
     dirs.thumbnail_dir.mkdir(parents=True, exist_ok=True)
     dirs.archive_dir.mkdir(parents=True, exist_ok=True)
     dirs.logging_dir.mkdir(parents=True, exist_ok=True)
 
+
+def setup_directories() -> Dirs:
+    root_dir = Path(tempfile.mkdtemp())
+    data_dir = root_dir / "data"
+    media_dir = root_dir / "media"
+    dirs = Dirs(
+        root_dir=root_dir,
+        data_dir=data_dir,
+        scratch_dir=root_dir / "scratch",
+        media_dir=media_dir,
+        consumption_dir=root_dir / "consume",
+        static_dir=root_dir / "static",
+        index_dir=data_dir / "index",
+        originals_dir=media_dir / "documents" / "originals",
+        thumbnail_dir=media_dir / "documents" / "thumbnails",
+        archive_dir=media_dir / "documents" / "archive",
+        logging_dir=data_dir / "log",
+    )
+
+    _make_subdirectories(dirs)
+
     dirs.settings_override = override_settings(
         DATA_DIR=dirs.data_dir,
         SCRATCH_DIR=dirs.scratch_dir,
@@ -66,15 +95,43 @@ def setup_directories():
     return dirs
 
 
-def remove_dirs(dirs):
-    shutil.rmtree(dirs.media_dir, ignore_errors=True)
-    shutil.rmtree(dirs.data_dir, ignore_errors=True)
-    shutil.rmtree(dirs.scratch_dir, ignore_errors=True)
-    shutil.rmtree(dirs.consumption_dir, ignore_errors=True)
-    shutil.rmtree(dirs.static_dir, ignore_errors=True)
+def remove_dirs(dirs: Dirs):
+    shutil.rmtree(dirs.root_dir, ignore_errors=True)
     dirs.settings_override.disable()
 
 
+def _restore_permissions_and_retry(func, path, exc_info):
+    """
+    shutil.rmtree error handler which restores the write permissions a test
+    may have removed, then retries removing path once.  Anything that still
+    fails is raised.
+    """
+    if not os.path.lexists(path):
+        return
+    os.chmod(os.path.dirname(path), 0o777)
+    if os.path.isdir(path) and not os.path.islink(path):
+        os.chmod(path, 0o777)
+        shutil.rmtree(path)
+    else:
+        os.unlink(path)
+
+
+def reset_directories(dirs: Dirs):
+    """
+    Empties the directories created by setup_directories, keeping their paths
+    (and so the settings override) intact for reuse by the next test
+    """
+    for top_level_dir in (
+        dirs.data_dir,
+        dirs.scratch_dir,
+        dirs.media_dir,
+        dirs.consumption_dir,
+        dirs.static_dir,
+    ):
+        shutil.rmtree(top_level_dir, onerror=_restore_permissions_and_retry)
+    _make_subdirectories(dirs)
+
+
 @contextmanager
 def paperless_environment():
     dirs = None
@@ -149,22 +206,26 @@ def util_call_with_backoff(
 
 class DirectoriesMixin:
     """
-    Creates and overrides settings for all folders and paths, then ensures
-    they are cleaned up on exit
+    Creates and overrides settings for all folders and paths once per test
+    class, empties them after each test, then ensures they are cleaned up
+    on exit
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.dirs = None
+    dirs = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dirs = setup_directories()
+        cls.addClassCleanup(remove_dirs, cls.dirs)
+        super().setUpClass()
 
     def setUp(self) -> None:
-        self.dirs = setup_directories()
+        # Emptied after the test rather than before it, since subclasses may
+        # write to these directories before calling super().setUp().
+        # Registered here so it runs after any cleanups added by the test.
+        self.addCleanup(reset_directories, self.dirs)
         super().setUp()
 
-    def tearDown(self) -> None:
-        super().tearDown()
-        remove_dirs(self.dirs)
-
 
 class FileSystemAssertsMixin:
     """